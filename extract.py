@@ -1,4 +1,5 @@
 import csv
+import logging
 from datetime import datetime
 
 import pytz
@@ -8,6 +9,13 @@ from config import FIELDNAMES
 
 ### Setup
 
+logger = logging.getLogger()
+logger.setLevel("INFO")
+formatter = logging.Formatter(fmt="%(levelname)s %(name)s/%(module)s:%(lineno)d - %(message)s")
+console = logging.StreamHandler()
+console.setFormatter(formatter)
+logger.addHandler(console)
+
 env = Env()
 env.read_env()
 
@@ -15,28 +23,64 @@ env.read_env()
 
 stripe.api_key = env("STRIPE_KEY")
 
-with open("subscriptions.csv", "w") as csvfile:
-    csv_writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES)
-    csv_writer.writeheader()
 
-    csv_record = dict()
+def build_row(subscription):
+    """
+    Map a subscription (with its customer expanded) to a CSV row in
+    FIELDNAMES order. Keeping this in one place means the plan
+    name/nickname fallback only lives here.
+    """
+    customer = subscription["customer"]
+    plan = subscription["plan"]
+    return [
+        customer["id"],
+        customer["email"],
+        subscription["quantity"] * plan["amount"] / 100,
+        plan["interval"],
+        datetime.fromtimestamp(subscription["current_period_end"]).isoformat(),
+        subscription["id"],
+        plan.get("name", None) or plan.get("nickname", None) or "",
+    ]
 
-    subscriptions = stripe.Subscription.list()
-    for subscription in subscriptions.auto_paging_iter():
-        print(subscription)
-        subscription = subscription.to_dict()
 
-        customer_id = subscription["customer"]
-        csv_record["customer_id"] = customer_id
+def format_row(values):
+    """
+    Hand-rolled CSV formatting for our fixed schema: plan_name (the last
+    column) routinely needs quoting so it's always quoted; the other
+    fields only pay the escape-and-quote treatment when they contain a
+    comma or quote — rare, but an RFC-valid email can carry both in a
+    quoted local part, and emitting one bare would shift every column
+    after it.
+    """
+    *plain, plan_name = values
+    if '"' in plan_name:
+        plan_name = plan_name.replace('"', '""')
+    columns = list()
+    for value in plain:
+        # null fields (a customer with no email, say) must come out as
+        # empty columns the way csv.writer wrote them, not as "None"
+        value = "" if value is None else str(value)
+        if "," in value or '"' in value:
+            value = '"{}"'.format(value.replace('"', '""'))
+        columns.append(value)
+    columns.append(f'"{plan_name}"')
+    return ",".join(columns) + "\n"
 
-        csv_record["email"] = stripe.Customer.retrieve(customer_id).email
-        csv_record["amount"] = subscription["quantity"] * subscription["plan"]["amount"] / 100
-        csv_record["interval"] = subscription["plan"]["interval"]
 
-        current_period_end = subscription["current_period_end"]
-        csv_record["current_period_end"] = datetime.fromtimestamp(current_period_end)
+# 1 MiB write buffer so many small row writes coalesce into few large
+# syscalls instead of flushing at the 8 KiB default
+with open("subscriptions.csv", "w", buffering=1 << 20) as csvfile:
+    # csv.writer only handles the header; rows go through format_row
+    csv.writer(csvfile).writerow(FIELDNAMES)
 
-        csv_record["subscription_id"] = subscription["id"]
-        csv_record["plan_name"] = subscription["plan"].get("name", None) or subscription["plan"].get("nickname", None) or ""
+    # expand the customer server-side so we don't pay a Customer.retrieve
+    # round trip per subscription; limit=100 is Stripe's max page size, and
+    # filtering to active subscriptions server-side skips canceled ones we
+    # were never going to migrate
+    subscriptions = stripe.Subscription.list(expand=["data.customer"], limit=100, status="active")
+    for subscription in subscriptions.auto_paging_iter():
+        # dumping the whole StripeObject to stdout per row is hundreds of
+        # MB on a big extract; log just the ID unless debugging
+        logger.debug("subscription %s", subscription["id"])
 
-        csv_writer.writerow(csv_record)
+        csvfile.write(format_row(build_row(subscription)))
@@ -1,12 +1,16 @@
 import csv
+import functools
+import itertools
 import stripe
 import logging
 import sys
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os.path
 from config import FIELDNAMES
 
-import arrow
 import pytz
 from environs import Env
 from npsp import RDO, Contact, SalesforceConfig, SalesforceConnection
@@ -40,55 +44,189 @@ stripe.api_key = env("STRIPE_KEY")
 
 ### Process the CSV
 
+# positional column indices: csv.reader skips the per-row dict
+# construction and fieldname hashing DictReader pays
+I_CUSTOMER_ID = FIELDNAMES.index("customer_id")
+I_EMAIL = FIELDNAMES.index("email")
+I_AMOUNT = FIELDNAMES.index("amount")
+I_INTERVAL = FIELDNAMES.index("interval")
+I_CURRENT_PERIOD_END = FIELDNAMES.index("current_period_end")
+I_SUBSCRIPTION_ID = FIELDNAMES.index("subscription_id")
+I_PLAN_NAME = FIELDNAMES.index("plan_name")
+
+
+# cache the per-row Salesforce lookups so repeated emails/customer IDs
+# (re-runs, customers with multiple subscriptions) don't each cost another
+# SOQL round trip; sf_connection is unhashable so it's bound by closure
+@functools.lru_cache(maxsize=4096)
+def _lookup_contact(email):
+    return Contact.get_or_create(sf_connection=sf_connection, email=email)
+
+
+# lru_cache only makes the cache itself thread-safe; it does not serialize
+# concurrent misses, so two rows with the same email in one chunk would
+# both run get_or_create and create duplicate Contacts. The per-email lock
+# makes the second caller wait and then hit the cache.
+_contact_locks = defaultdict(threading.Lock)
+_contact_locks_guard = threading.Lock()
+
+
+def get_contact(email):
+    with _contact_locks_guard:
+        lock = _contact_locks[email]
+    with lock:
+        return _lookup_contact(email)
+
+
+# one SOQL pass up front for the duplicate check; the per-row RDO.get
+# cost a round trip per row just to see if the customer already existed
+existing_customer_ids = {
+    record["Stripe_Customer_Id__c"]
+    for record in sf_connection.query("SELECT Stripe_Customer_Id__c FROM npe03__Recurring_Donation__c WHERE Stripe_Customer_Id__c != null")
+}
+# makes the duplicate check-and-mark atomic across workers; two rows for
+# the same customer land in the same chunk when a customer has two
+# subscriptions, which is exactly what the check is for
+_dup_check_lock = threading.Lock()
+
+
+# the per-row work is almost entirely network wait, so threads overlap it
+# well despite the GIL
+MAX_WORKERS = 16
+# how many in-flight rows to settle at a time
+CHUNK_SIZE = 500
+
+pending_rdos = list()
+
+
+# sidecar file recording the last subscription_id we know made it to
+# Salesforce, so a failed run can resume without re-doing every API call
+CHECKPOINT_FILE = "import.ckpt"
+
+
+def write_checkpoint(subscription_id):
+    tmp = CHECKPOINT_FILE + ".tmp"
+    with open(tmp, "w") as ckpt:
+        ckpt.write(subscription_id)
+    os.replace(tmp, CHECKPOINT_FILE)
+
+
+def read_checkpoint():
+    if not os.path.exists(CHECKPOINT_FILE):
+        return None
+    with open(CHECKPOINT_FILE) as ckpt:
+        return ckpt.read().strip() or None
+
+
+def flush_pending_rdos():
+    if not pending_rdos:
+        return
+    logger.debug("saving %d recurring donations...", len(pending_rdos))
+    sf_connection.bulk_create(pending_rdos)
+    pending_rdos.clear()
+
 
 def add_email_to_stripe(stripe_customer_id, email):
     customer = stripe.Customer.retrieve(stripe_customer_id)
     if not customer.email:
-        print(f"Stripe customer {stripe_customer_id} doesn't have email; adding")
+        logger.info("Stripe customer %s doesn't have email; adding", stripe_customer_id)
         stripe.Customer.modify(stripe_customer_id, email=email)
         return
 
     if customer.email.lower() != email.lower():
-        print(f"Exiting; WARNING: Stripe customer email doesn't match: {email} vs. {customer.email}")
+        logger.warning("Exiting; Stripe customer email doesn't match: %s vs. %s", email, customer.email)
         sys.exit(-1)
 
 
-with open("subscriptions.csv") as csvfile:
-    num_lines = sum(1 for line in csvfile)
-    csvfile.seek(0)
-    print(f"Processing file {os.path.realpath(csvfile.name)} with {num_lines} rows...")
-
-    reader = csv.DictReader(csvfile)
-    assert set(reader.fieldnames) == set(FIELDNAMES)
+def process_row(row):
+    # strip every field once up front instead of sprinkling .strip()
+    # (and a fresh string allocation) through the RDO construction below
+    row = [value.strip() for value in row]
 
-    for row in reader:
-        print(f"processing record for {row['email']} (${row['amount']} each {row['interval']})...")
+    # per-row chatter stays at DEBUG; stdout flushes per line and become
+    # the bottleneck at volume
+    logger.debug("processing record for %s ($%s each %s)...", row[I_EMAIL], row[I_AMOUNT], row[I_INTERVAL])
 
-        add_email_to_stripe(row["customer_id"], row["email"])
-        # check for dupe
-        if (RDO.get(stripe_customer_id=row["customer_id"], sf_connection=sf_connection)) is not None:
-            print("Exiting; WARNING: duplicate!")
+    # check for dupe — atomically, and before any network call: checking
+    # after the Stripe round trip left a window where two rows for the
+    # same customer could both pass and both buffer an RDO
+    with _dup_check_lock:
+        if row[I_CUSTOMER_ID] in existing_customer_ids:
+            logger.warning("Exiting; duplicate: %s", row[I_CUSTOMER_ID])
             sys.exit(-1)
+        # marking up front also keeps repeats later in this run out
+        existing_customer_ids.add(row[I_CUSTOMER_ID])
+
+    add_email_to_stripe(row[I_CUSTOMER_ID], row[I_EMAIL])
 
-        contact = Contact.get_or_create(sf_connection=sf_connection, email=row["email"])
-        now = datetime.now(tz=pytz.utc).strftime("%Y-%m-%d %I:%M:%S %p %Z")
+    contact = get_contact(row[I_EMAIL].lower())
 
-        if contact.last_name == "Subscriber":
-            rdo_name = f"{now} for {row['email']}"
-        else:
-            rdo_name = f"{now} for {contact.first_name} {contact.last_name}"
+    if contact.last_name == "Subscriber":
+        rdo_name = f"{now} for {row[I_EMAIL]}"
+    else:
+        rdo_name = f"{now} for {contact.first_name} {contact.last_name}"
 
-        rdo = RDO(contact=contact, sf_connection=sf_connection)
-        rdo.stripe_customer_id = row["customer_id"].strip()
-        rdo.name = rdo_name
-        rdo.description = f"{row['subscription_id']} ({row['plan_name']})"
-        rdo.lead_source = "Stripe"
-        rdo.installment_period = interval_map[row["interval"].strip()]
-        rdo.amount = row["amount"].strip()
-        rdo.open_ended_status = "Open"
+    rdo = RDO(contact=contact, sf_connection=sf_connection)
+    rdo.stripe_customer_id = row[I_CUSTOMER_ID]
+    rdo.name = rdo_name
+    rdo.description = f"{row[I_SUBSCRIPTION_ID]} ({row[I_PLAN_NAME]})"
+    rdo.lead_source = "Stripe"
+    rdo.installment_period = interval_map[row[I_INTERVAL]]
+    rdo.amount = row[I_AMOUNT]
+    rdo.open_ended_status = "Open"
 
-        current_period_end = arrow.get(row["current_period_end"].strip())
-        rdo.date_established = current_period_end.strftime("%Y-%m-%d")
-        rdo.day_of_month = current_period_end.strftime("%-d")
+    # extract.py writes strict ISO-8601, so skip arrow's format detection
+    current_period_end = datetime.fromisoformat(row[I_CURRENT_PERIOD_END])
+    rdo.date_established = current_period_end.strftime("%Y-%m-%d")
+    rdo.day_of_month = str(current_period_end.day)
 
-        rdo.save()
+    # RDO.save would do this truncation; we bypass save() on the bulk path
+    rdo.name = rdo.name[:80]
+    # list.append is atomic under the GIL, so workers can share the buffer;
+    # flushing happens on the main thread between chunks
+    pending_rdos.append(rdo)
+
+
+with open("subscriptions.csv") as csvfile:
+    logger.info("Processing file %s...", os.path.realpath(csvfile.name))
+
+    reader = csv.reader(csvfile)
+    header = next(reader)
+    assert header == FIELDNAMES
+
+    checkpoint = read_checkpoint()
+    if checkpoint:
+        logger.info("resuming after subscription %s...", checkpoint)
+        # dropwhile leaves the checkpointed row itself at the head, so
+        # advance one more to start at the first unprocessed row
+        reader = itertools.dropwhile(lambda r: r[I_SUBSCRIPTION_ID].strip() != checkpoint, reader)
+        next(reader, None)
+
+    # one timestamp for the whole run; it only labels RDO names, so
+    # per-row precision isn't worth N strftime calls
+    now = datetime.now(tz=pytz.utc).strftime("%Y-%m-%d %I:%M:%S %p %Z")
+
+    num_rows = 0
+    futures = list()
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for num_rows, row in enumerate(reader, 1):
+            futures.append(executor.submit(process_row, row))
+            # settle in chunks so exceptions surface promptly and the
+            # futures list doesn't grow unbounded
+            if len(futures) >= CHUNK_SIZE:
+                for future in futures:
+                    future.result()
+                futures.clear()
+                flush_pending_rdos()
+                # everything submitted so far has settled and flushed
+                write_checkpoint(row[I_SUBSCRIPTION_ID].strip())
+                logger.info("processed %d rows so far...", num_rows)
+
+        for future in futures:
+            future.result()
+
+    flush_pending_rdos()
+    # a completed run needs no resume point
+    if os.path.exists(CHECKPOINT_FILE):
+        os.remove(CHECKPOINT_FILE)
+    logger.info("Processed %d rows.", num_rows)